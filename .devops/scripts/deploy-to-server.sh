@@ -126,6 +126,8 @@ SERVICE_NAME="${CFG_service_name:-}"
 BACKUP_ENABLED="${CFG_backup_enabled:-true}"
 BACKUP_DIR="${CFG_backup_dir:-/var/backups}"
 BACKUP_PREFIX="${CFG_backup_prefix:-$SERVICE_NAME}"
+SERVICE_PORT="${CFG_service_port:-8000}"
+READY_TIMEOUT="${CFG_service_ready_timeout:-60}"
 
 # Validate
 if [ -z "$SERVER_HOST" ] || [ -z "$DEPLOY_PATH" ] || [ -z "$SERVICE_NAME" ]; then
@@ -255,6 +257,25 @@ else
     exit 1
 fi
 
+# Readiness check (python-api: /ready turns 200 once startup warmup is done)
+if [ "$SERVER_TYPE" = "python-api" ]; then
+    echo -e "${YELLOW}⏳ Waiting for readiness (up to ${READY_TIMEOUT}s)...${NC}"
+    if ssh "$SERVER_USER@$SERVER_HOST" bash << EOF
+for i in \$(seq 1 $READY_TIMEOUT); do
+    curl -fs "http://localhost:$SERVICE_PORT/ready" > /dev/null && exit 0
+    sleep 1
+done
+exit 1
+EOF
+    then
+        echo -e "${GREEN}✅ Service is ready${NC}"
+    else
+        echo -e "${RED}❌ Service did not become ready within ${READY_TIMEOUT}s${NC}"
+        echo -e "${YELLOW}Check warmup: ssh $SERVER_USER@$SERVER_HOST 'curl -s http://localhost:$SERVICE_PORT/ready'${NC}"
+        exit 1
+    fi
+fi
+
 echo ""
 echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
 echo -e "${GREEN}✅ Deployment completed successfully!${NC}"
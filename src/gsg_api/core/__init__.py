@@ -1,6 +1,23 @@
 """Core module - config, auth, database"""
 from .config import get_settings, Settings
-from .auth import verify_api_key
-from .database import db, DatabaseManager
+from .auth import verify_api_key, is_admin_key
+from .database import db, DatabaseManager, DatabaseUnavailableError
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .health import health_monitor, HealthMonitor
+from .limiter import AdaptiveLimiter, RequestShedError, request_deadline
+from .timing import ServerTiming, TimedRoute, server_timing, timed
+from .profiler import SamplingProfiler
+from .response_cache import response_cache, ResponseCache, CachedResponse
+from .compression import CompressionMiddleware, negotiate, compress
+from .traffic_capture import traffic_recorder, TrafficRecorder, TrafficCaptureMiddleware
 
-__all__ = ["get_settings", "Settings", "verify_api_key", "db", "DatabaseManager"]
+__all__ = [
+    "get_settings", "Settings", "verify_api_key", "is_admin_key", "db", "DatabaseManager",
+    "DatabaseUnavailableError", "CircuitBreaker", "CircuitOpenError",
+    "health_monitor", "HealthMonitor",
+    "AdaptiveLimiter", "RequestShedError", "request_deadline",
+    "ServerTiming", "TimedRoute", "server_timing", "timed", "SamplingProfiler",
+    "response_cache", "ResponseCache", "CachedResponse",
+    "CompressionMiddleware", "negotiate", "compress",
+    "traffic_recorder", "TrafficRecorder", "TrafficCaptureMiddleware",
+]
@@ -33,10 +33,16 @@ async def verify_api_key(api_key: str = Security(API_KEY_HEADER)) -> str:
             headers={"WWW-Authenticate": "ApiKey"},
         )
 
-    if api_key not in settings.valid_api_keys:
+    # Admin keys are full API keys too
+    if api_key not in settings.valid_api_keys and not is_admin_key(api_key):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API key",
         )
 
     return api_key
+
+
+def is_admin_key(api_key: str) -> bool:
+    """Check whether the key may use admin-only features (profiling)"""
+    return bool(api_key) and api_key in get_settings().valid_admin_api_keys
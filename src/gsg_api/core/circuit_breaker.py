@@ -0,0 +1,97 @@
+"""
+Circuit Breaker for database access
+"""
+import threading
+import time
+from typing import Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} unavailable (circuit open, retry in {retry_after:.0f}s)")
+
+
+class CircuitBreaker:
+    """
+    Classic three-state circuit breaker.
+
+    - closed: calls pass; consecutive failures are counted
+    - open: calls fail fast until `reset_timeout` has elapsed
+    - half_open: a single trial call is let through; success closes
+      the circuit, failure re-opens it
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._retry_after() <= 0:
+                return self.HALF_OPEN
+            return self._state
+
+    def _retry_after(self) -> float:
+        return self._opened_at + self.reset_timeout - time.monotonic()
+
+    def before_call(self) -> None:
+        """
+        Gate a call through the breaker.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a half-open trial is running)
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            retry_after = self._retry_after()
+            if self._state == self.OPEN and retry_after > 0:
+                raise CircuitOpenError(self.name, retry_after)
+            if self._trial_in_flight:
+                raise CircuitOpenError(self.name, max(retry_after, 1.0))
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+            self.last_error = None
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if error is not None:
+                self.last_error = f"{type(error).__name__}: {error}"
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        """Current state for health/metrics endpoints"""
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_after": max(0.0, round(self._retry_after(), 1)) if state != self.CLOSED else 0.0,
+                "last_error": self.last_error,
+            }
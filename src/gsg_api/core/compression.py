@@ -0,0 +1,194 @@
+"""
+Response Compression - Accept-Encoding negotiation (zstd, br, gzip)
+"""
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import get_settings
+
+
+# Compression level per encoding for each compressible content type.
+# Types not listed here (images, archives, ...) are never compressed.
+CONTENT_TYPE_POLICIES: Dict[str, Dict[str, int]] = {
+    "application/json": {"zstd": 3, "br": 5, "gzip": 6},
+    "text/plain": {"zstd": 3, "br": 5, "gzip": 6},
+    "text/html": {"zstd": 6, "br": 9, "gzip": 9},
+    "text/css": {"zstd": 6, "br": 9, "gzip": 9},
+    "text/csv": {"zstd": 3, "br": 4, "gzip": 6},
+    "application/x-ndjson": {"zstd": 3, "br": 4, "gzip": 6},
+    "application/javascript": {"zstd": 6, "br": 9, "gzip": 9},
+}
+
+
+def _available() -> List[str]:
+    enabled = [e.strip() for e in get_settings().compression_encodings.split(",") if e.strip()]
+    return [e for e in enabled if e in ("zstd", "br", "gzip")]
+
+
+# Server preference order (first wins on equal q-values)
+AVAILABLE_ENCODINGS = _available()
+
+
+def content_type_policy(media_type: Optional[str]) -> Optional[Dict[str, int]]:
+    """Compression levels for a Content-Type, or None if it shouldn't be compressed"""
+    if not media_type:
+        return None
+    return CONTENT_TYPE_POLICIES.get(media_type.split(";")[0].strip().lower())
+
+
+def negotiate(accept_encoding: Optional[str], media_type: Optional[str] = None) -> Optional[str]:
+    """
+    Pick the best encoding the client accepts for this content type.
+
+    Honours q-values (including `q=0` and `*`); ties are broken by
+    server preference. Returns None for identity.
+    """
+    if not accept_encoding or not AVAILABLE_ENCODINGS:
+        return None
+    if media_type is not None and content_type_policy(media_type) is None:
+        return None
+
+    qvalues: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding.lower()] = q
+
+    best: Optional[Tuple[float, str]] = None
+    for encoding in AVAILABLE_ENCODINGS:
+        q = qvalues.get(encoding, qvalues.get("*", 0.0))
+        if q > 0 and (best is None or q > best[0]):
+            best = (q, encoding)
+    return best[1] if best else None
+
+
+def compress(body: bytes, encoding: str, media_type: Optional[str] = None) -> bytes:
+    """Compress a complete body in one shot"""
+    compressor = streaming_compressor(encoding, media_type)
+    return compressor.compress(body) + compressor.finish()
+
+
+class _StreamCompressor:
+    """Uniform wrapper over zlib, brotli and zstandard compressors"""
+
+    def __init__(
+        self,
+        compress: Callable[[bytes], bytes],
+        flush: Callable[[], bytes],
+        finish: Callable[[], bytes],
+    ):
+        self.compress = compress
+        self.flush = flush  # Emit everything buffered so far, keep the stream open
+        self.finish = finish
+
+
+def streaming_compressor(encoding: str, media_type: Optional[str] = None) -> _StreamCompressor:
+    """Incremental compressor for streamed bodies"""
+    level = (content_type_policy(media_type) or CONTENT_TYPE_POLICIES["application/json"])[encoding]
+
+    if encoding == "gzip":
+        obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return _StreamCompressor(obj.compress, lambda: obj.flush(zlib.Z_SYNC_FLUSH), obj.flush)
+    if encoding == "br":
+        obj = brotli.Compressor(quality=level)
+        return _StreamCompressor(obj.process, obj.flush, obj.finish)
+    if encoding == "zstd":
+        obj = zstandard.ZstdCompressor(level=level).compressobj()
+        return _StreamCompressor(
+            obj.compress, lambda: obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK), obj.flush
+        )
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses per Accept-Encoding.
+
+    Bodies below `minimum_size`, non-compressible content types and
+    responses that already carry a Content-Encoding (e.g. pre-compressed
+    cache hits) pass through untouched. Streaming responses are compressed
+    chunk by chunk and flushed per chunk so exports start arriving at once.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        if negotiate(accept_encoding) is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        encoding: Optional[str] = None
+        compressor: Optional[_StreamCompressor] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, encoding, compressor
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" not in headers:
+                    encoding = negotiate(accept_encoding, headers.get("content-type"))
+                if encoding is None:
+                    await send(message)
+                else:
+                    # Hold the headers until we've seen the first body chunk
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or encoding is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                pending, start_message = start_message, None
+                if not more_body and len(body) < self.minimum_size:
+                    encoding = None
+                    await send(pending)
+                    await send(message)
+                    return
+
+                headers = MutableHeaders(raw=pending["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                compressor = streaming_compressor(encoding, headers.get("content-type"))
+
+                if not more_body:
+                    data = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(data))
+                    await send(pending)
+                    await send({"type": "http.response.body", "body": data})
+                    return
+
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await send(pending)
+
+            data = compressor.compress(body)
+            data += compressor.flush() if more_body else compressor.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -19,6 +19,35 @@ class Settings(BaseSettings):
 
     # Authentication
     api_keys: str = ""  # Comma-separated list of valid API keys
+    admin_api_keys: str = ""  # Comma-separated keys allowed to use ?profile=1
+
+    # Response cache (/products list pages)
+    response_cache_max_bytes: int = 64 * 1024 * 1024  # 0 disables the cache
+    response_cache_ttl: float = 300.0
+    catalog_version_interval: float = 60.0  # Seconds between catalog change checks
+
+    # Response compression
+    compress_min_bytes: int = 1024  # Smaller bodies are sent uncompressed
+    compression_encodings: str = "zstd,br,gzip"  # Enabled codecs in preference order
+
+    # Traffic capture (for tools/replay.py)
+    capture_enabled: bool = False
+    capture_sample_rate: float = 0.01  # Fraction of API requests recorded
+    capture_path: str = "captures/traffic.jsonl"
+    capture_max_bytes: int = 50 * 1024 * 1024  # Rotate after this size
+    capture_backup_count: int = 5
+
+    # Compact text format
+    compact_default_max_tokens: int = 4000  # Budget when the client sends none (0 = unlimited)
+
+    # Startup warmup
+    warmup_enabled: bool = True
+    warmup_budget_seconds: float = 30.0  # Serve anyway (not ready) after this long
+    warmup_connections: int = 4  # Connections opened up front
+    warmup_top_brands: int = 5  # Brands whose first /products page is pre-rendered
+
+    # Profiling
+    profile_sample_interval: float = 0.001  # Seconds between stack samples
 
     # Database
     mssql_host: str = "192.168.2.63"
@@ -27,6 +56,32 @@ class Settings(BaseSettings):
     mssql_user: str = ""
     mssql_password: str = ""
 
+    # Database resilience
+    db_login_timeout: int = 5  # Seconds for ODBC login
+    db_query_timeout: int = 30  # Seconds per statement (0 = no limit)
+    db_pool_size: int = 8  # Idle connections kept for reuse (0 = connect per query)
+    db_pool_idle_seconds: float = 300.0  # Close pooled connections idle longer than this
+    db_retry_attempts: int = 2  # Retries for transient connection errors/deadlocks
+    db_retry_backoff: float = 0.2  # Base backoff seconds (exponential, jittered)
+    db_breaker_failure_threshold: int = 5  # Consecutive failures before opening
+    db_breaker_reset_seconds: float = 30.0  # Open duration before a half-open trial
+    health_check_interval: float = 10.0  # Background DB probe interval
+
+    # Adaptive DB concurrency limit (per worker)
+    db_limit_initial: int = 8
+    db_limit_min: int = 1
+    db_limit_max: int = 24
+    db_limit_max_queue: int = 24  # Waiting requests before shedding
+    threadpool_size: int = 64  # Worker threads for sync endpoints
+    threadpool_reserve: int = 16  # Threads never taken by DB queries or their queue
+    db_limit_request_deadline: float = 15.0  # Default deadline without X-Request-Timeout
+    db_limit_latency_tolerance: float = 2.0  # Latency vs. baseline before backing off
+
+    # Brand index (listMarken)
+    brand_index_refresh_seconds: int = 900
+    brand_index_retry_seconds: int = 5  # Retry interval until the first successful load
+    brand_fuzzy_cutoff: float = 0.8
+
     # CORS
     cors_origins: str = "*"
 
@@ -37,6 +92,13 @@ class Settings(BaseSettings):
             return []
         return [k.strip() for k in self.api_keys.split(",") if k.strip()]
 
+    @property
+    def valid_admin_api_keys(self) -> List[str]:
+        """Parse comma-separated admin API keys"""
+        if not self.admin_api_keys:
+            return []
+        return [k.strip() for k in self.admin_api_keys.split(",") if k.strip()]
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse comma-separated CORS origins"""
@@ -1,26 +1,227 @@
 """
 Database Connection Manager for MSSQL
 """
+import logging
+import random
+import threading
+import time
 import pyodbc
 from contextlib import contextmanager
-from typing import Generator, List, Dict, Any, Optional
+from typing import Callable, Generator, List, Dict, Any, Optional, Tuple, TypeVar
 from .config import get_settings
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .limiter import AdaptiveLimiter, request_deadline
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# SQLSTATE prefixes/codes that indicate the server is unreachable or the
+# statement may succeed when simply retried
+CONNECTION_SQLSTATES = ("08",)
+TIMEOUT_SQLSTATES = ("HYT00", "HYT01")
+RETRYABLE_SQLSTATES = ("40001",)  # deadlock victim
+
+
+class DatabaseUnavailableError(Exception):
+    """Raised when the database can't be reached (or the circuit is open)"""
+
+    def __init__(self, message: str, retry_after: float = 5.0):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+def _sqlstate(error: pyodbc.Error) -> str:
+    return str(error.args[0]) if error.args else ""
+
+
+def _is_connection_error(error: pyodbc.Error) -> bool:
+    return isinstance(error, (pyodbc.OperationalError, pyodbc.InterfaceError)) or \
+        _sqlstate(error).startswith(CONNECTION_SQLSTATES)
+
+
+def _is_timeout(error: pyodbc.Error) -> bool:
+    return _sqlstate(error) in TIMEOUT_SQLSTATES
+
+
+def _close_quietly(conn: pyodbc.Connection) -> None:
+    try:
+        conn.close()
+    except pyodbc.Error:
+        pass
 
 
 class DatabaseManager:
-    """Manages MSSQL database connections"""
+    """
+    Manages MSSQL database connections.
+
+    Up to `db_pool_size` connections are kept open after use and handed
+    out again (most recently used first). Connections idle for longer than
+    `db_pool_idle_seconds` are closed. A connection that raised an error is
+    closed, and a connection error also drops every other idle connection,
+    since they likely point at the same dead server.
+    """
 
     def __init__(self):
-        self._connection_string = get_settings().mssql_connection_string
+        settings = get_settings()
+        self._connection_string = settings.mssql_connection_string
+        self._login_timeout = settings.db_login_timeout
+        self._query_timeout = settings.db_query_timeout
+        self._retry_attempts = settings.db_retry_attempts
+        self._retry_backoff = settings.db_retry_backoff
+        self._pool_size = settings.db_pool_size
+        self._pool_idle_seconds = settings.db_pool_idle_seconds
+        self._pool_lock = threading.Lock()
+        self._idle: List[Tuple[pyodbc.Connection, float]] = []
+        self.breaker = CircuitBreaker(
+            "database",
+            failure_threshold=settings.db_breaker_failure_threshold,
+            reset_timeout=settings.db_breaker_reset_seconds,
+        )
+        self.limiter = AdaptiveLimiter(
+            initial_limit=settings.db_limit_initial,
+            min_limit=settings.db_limit_min,
+            max_limit=settings.db_limit_max,
+            max_queue=settings.db_limit_max_queue,
+            tolerance=settings.db_limit_latency_tolerance,
+        )
+
+    def _checkout(self) -> Optional[pyodbc.Connection]:
+        """Most recently used idle connection, closing expired ones"""
+        expired = []
+        conn = None
+        with self._pool_lock:
+            now = time.monotonic()
+            while self._idle:
+                candidate, idle_since = self._idle.pop()
+                if now - idle_since > self._pool_idle_seconds:
+                    expired.append(candidate)
+                else:
+                    conn = candidate
+                    break
+            # Older entries sit below; anything expired there goes too
+            while self._idle and now - self._idle[0][1] > self._pool_idle_seconds:
+                expired.append(self._idle.pop(0)[0])
+        for candidate in expired:
+            _close_quietly(candidate)
+        return conn
+
+    def _checkin(self, conn: pyodbc.Connection) -> None:
+        with self._pool_lock:
+            if len(self._idle) < self._pool_size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        _close_quietly(conn)
+
+    def close_pool(self) -> None:
+        """Close all idle connections"""
+        with self._pool_lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+    def pool_snapshot(self) -> dict:
+        with self._pool_lock:
+            return {"idle": len(self._idle), "size": self._pool_size}
 
     @contextmanager
     def get_connection(self) -> Generator[pyodbc.Connection, None, None]:
-        """Get a database connection (context manager)"""
-        conn = pyodbc.connect(self._connection_string)
+        """Get a database connection (context manager), pooled when possible"""
+        conn = self._checkout()
+        if conn is None:
+            with timed("db-connect"):
+                conn = pyodbc.connect(self._connection_string, timeout=self._login_timeout)
+            conn.timeout = self._query_timeout
         try:
             yield conn
+        except BaseException as e:
+            _close_quietly(conn)
+            if isinstance(e, pyodbc.Error) and _is_connection_error(e):
+                self.close_pool()
+            raise
+        else:
+            try:
+                # End the implicit transaction before the connection is reused
+                conn.rollback()
+            except pyodbc.Error:
+                _close_quietly(conn)
+                return
+            self._checkin(conn)
+
+    def _run(self, fn: Callable[[pyodbc.Connection], T], probe: bool = False) -> T:
+        """
+        Run `fn` on a fresh connection behind the circuit breaker and
+        concurrency limiter (both skipped for health probes and background checks).
+
+        Raises:
+            DatabaseUnavailableError: If the circuit is open or the server is unreachable
+            RequestShedError: If the limiter rejects the query
+        """
+        if probe:
+            return self._execute(fn)
+
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            raise DatabaseUnavailableError(str(e), retry_after=e.retry_after) from e
+
+        with timed("db-queue"):
+            self.limiter.acquire(request_deadline.get())
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = self._execute(fn)
+            ok = True
+            return result
+        except DatabaseUnavailableError:
+            raise
+        except Exception:
+            # The server answered; only unavailability should shrink the limit
+            ok = True
+            raise
         finally:
-            conn.close()
+            self.limiter.release(time.perf_counter() - start, ok=ok)
+
+    def _execute(self, fn: Callable[[pyodbc.Connection], T]) -> T:
+        """
+        Run `fn` with retries, recording the outcome on the breaker.
+
+        Connection errors and deadlocks are retried with jittered
+        exponential backoff. Connection errors and timeouts count as
+        breaker failures; other SQL errors mean the server answered.
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.get_connection() as conn:
+                    result = fn(conn)
+                self.breaker.record_success()
+                return result
+            except pyodbc.Error as e:
+                timeout = _is_timeout(e)
+                connection_error = not timeout and _is_connection_error(e)
+                if not (connection_error or timeout):
+                    # Server responded (e.g. SQL error or deadlock) - it's healthy
+                    self.breaker.record_success()
+                    if _sqlstate(e) not in RETRYABLE_SQLSTATES or attempt >= self._retry_attempts:
+                        raise
+                elif not connection_error or attempt >= self._retry_attempts:
+                    self.breaker.record_failure(e)
+                    raise DatabaseUnavailableError(
+                        f"Database unavailable: {e}",
+                        retry_after=self.breaker.reset_timeout,
+                    ) from e
+
+                attempt += 1
+                delay = self._retry_backoff * (2 ** (attempt - 1))
+                delay = random.uniform(delay / 2, delay)
+                logger.warning("Transient database error (attempt %d): %s - retrying in %.2fs", attempt, e, delay)
+                time.sleep(delay)
+            except Exception:
+                # Not a driver error - the connection itself worked
+                self.breaker.record_success()
+                raise
 
     def execute_query(
         self,
@@ -39,7 +240,7 @@ class DatabaseManager:
         Returns:
             List of dictionaries with column names as keys
         """
-        with self.get_connection() as conn:
+        def run(conn: pyodbc.Connection) -> List[Dict[str, Any]]:
             cursor = conn.cursor()
 
             if params:
@@ -59,9 +260,17 @@ class DatabaseManager:
             # Convert to list of dicts
             return [dict(zip(columns, row)) for row in rows]
 
-    def execute_scalar(self, query: str, params: Optional[tuple] = None) -> Any:
-        """Execute a query and return single value"""
-        with self.get_connection() as conn:
+        return self._run(run)
+
+    def execute_scalar(self, query: str, params: Optional[tuple] = None, background: bool = False) -> Any:
+        """
+        Execute a query and return single value.
+
+        `background` queries (periodic checks, not request work) skip the
+        circuit breaker gate and the concurrency limiter, so they neither
+        queue behind requests nor feed their latency into the limit.
+        """
+        def run(conn: pyodbc.Connection) -> Any:
             cursor = conn.cursor()
             if params:
                 cursor.execute(query, params)
@@ -70,6 +279,20 @@ class DatabaseManager:
             row = cursor.fetchone()
             return row[0] if row else None
 
+        return self._run(run, probe=background)
+
+    def ping(self) -> bool:
+        """
+        Run `SELECT 1`, bypassing the open-circuit gate and the limiter.
+
+        Used by the health monitor so a recovered server closes the
+        breaker without waiting for a user request to probe it.
+        """
+        def run(conn: pyodbc.Connection) -> Any:
+            return conn.cursor().execute("SELECT 1").fetchone()[0]
+
+        return self._run(run, probe=True) == 1
+
 
 # Global instance
 db = DatabaseManager()
@@ -0,0 +1,89 @@
+"""
+Background Database Health Monitor
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from .config import get_settings
+from .database import db
+from .response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """
+    Probes the database on an interval and caches the result.
+
+    `/health` reads the cached status instead of opening a connection per
+    probe. Probes also feed the circuit breaker, so a recovered server
+    closes it without a user request having to pay for the trial.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._status: Dict[str, Any] = {
+            "database": "unknown",
+            "latency_ms": None,
+            "checked_at": None,
+        }
+
+    @property
+    def status(self) -> Dict[str, Any]:
+        return {
+            **self._status,
+            "circuit": db.breaker.snapshot(),
+            "db_limiter": db.limiter.snapshot(),
+            "db_pool": db.pool_snapshot(),
+            "response_cache": response_cache.snapshot(),
+        }
+
+    @property
+    def healthy(self) -> bool:
+        return self._status["database"] == "connected"
+
+    async def check(self) -> None:
+        """Run a single probe and publish the result"""
+        start = time.perf_counter()
+        try:
+            ok = await asyncio.wait_for(asyncio.to_thread(db.ping), timeout=self.interval)
+            db_status = "connected" if ok else "error"
+        except asyncio.TimeoutError:
+            db_status = "error: probe timed out"
+        except Exception as e:
+            db_status = f"error: {str(e)}"
+
+        if db_status != self._status["database"]:
+            logger.info("Database status: %s -> %s", self._status["database"], db_status)
+
+        self._status = {
+            "database": db_status,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global instance
+health_monitor = HealthMonitor(get_settings().health_check_interval)
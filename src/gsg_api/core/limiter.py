@@ -0,0 +1,171 @@
+"""
+Adaptive Concurrency Limiter for database-bound work
+"""
+import logging
+import statistics
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Absolute time.monotonic() deadline of the current request (set by middleware)
+request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class RequestShedError(Exception):
+    """Raised when a request is rejected by the limiter instead of queued"""
+
+    def __init__(self, reason: str, retry_after: float = 1.0):
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"Request shed: {reason}")
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit sized from observed query latency.
+
+    Successful query latencies are collected in windows of `window`
+    samples. Each window's median is compared with a long-term baseline
+    (a slow EWMA of past window medians), so neither a mix of fast and
+    slow query types nor a single outlier looks like congestion. When a
+    window's median exceeds `tolerance` x
+    baseline the limit shrinks by `backoff`; otherwise, if the limiter was
+    at least half utilized during the window, it grows by one. Failures
+    shrink it immediately.
+
+    Callers over the limit wait in a bounded queue until a slot frees up or
+    their deadline passes. Expired deadlines and a full queue are shed
+    immediately.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        max_queue: int = 64,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+        window: int = 20,
+        smoothing: float = 0.05,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.window = window
+        self.smoothing = smoothing
+        self._cond = threading.Condition()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._queued = 0
+        self._window_ms: List[float] = []
+        self._window_utilized = False
+        self._baseline_ms: Optional[float] = None
+        self._ewma_ms: Optional[float] = None
+        self._shed: Dict[str, int] = {"deadline": 0, "queue_full": 0, "queue_timeout": 0}
+
+    def fit_threads(self, threads: int) -> None:
+        """
+        Cap max limit + queue at `threads`.
+
+        Queued callers block a worker thread while they wait, so a queue
+        larger than the threadpool can never fill (queue_full never fires)
+        and would starve requests that need no database.
+        """
+        with self._cond:
+            if self.max_limit + self.max_queue <= threads:
+                return
+            max_limit = max(self.min_limit, min(self.max_limit, threads))
+            max_queue = max(0, threads - max_limit)
+            logger.warning(
+                "DB limit %d + queue %d exceed %d available threads, using %d + %d",
+                self.max_limit, self.max_queue, threads, max_limit, max_queue,
+            )
+            self.max_limit = max_limit
+            self.max_queue = max_queue
+            self._limit = min(self._limit, float(max_limit))
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    def _shed_request(self, reason: str) -> RequestShedError:
+        self._shed[reason] += 1
+        return RequestShedError(reason)
+
+    def acquire(self, deadline: Optional[float] = None) -> None:
+        """
+        Take a concurrency slot, waiting in the queue if necessary.
+
+        Raises:
+            RequestShedError: If the deadline has passed or the queue is full
+        """
+        with self._cond:
+            if deadline is not None and deadline <= time.monotonic():
+                raise self._shed_request("deadline")
+
+            if self._in_flight >= self.limit:
+                if self._queued >= self.max_queue:
+                    raise self._shed_request("queue_full")
+
+                self._queued += 1
+                try:
+                    while self._in_flight >= self.limit:
+                        timeout = None if deadline is None else deadline - time.monotonic()
+                        if timeout is not None and timeout <= 0:
+                            raise self._shed_request("queue_timeout")
+                        self._cond.wait(timeout)
+                finally:
+                    self._queued -= 1
+
+            self._in_flight += 1
+
+    def release(self, latency: float, ok: bool = True) -> None:
+        """Free a slot and feed the latency sample (seconds) into the limit"""
+        with self._cond:
+            utilized = self._in_flight >= self.limit / 2
+            self._in_flight -= 1
+
+            ms = latency * 1000
+            self._ewma_ms = ms if self._ewma_ms is None else 0.9 * self._ewma_ms + 0.1 * ms
+
+            if ok:
+                self._window_ms.append(ms)
+                self._window_utilized = self._window_utilized or utilized
+                if len(self._window_ms) >= self.window:
+                    self._end_window()
+            else:
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+
+            self._cond.notify()
+
+    def _end_window(self) -> None:
+        """Adjust the limit from the finished window's median (lock held)"""
+        median = statistics.median(self._window_ms)
+        if self._baseline_ms is None:
+            self._baseline_ms = median
+        elif median > self._baseline_ms * self.tolerance:
+            self._limit = max(self.min_limit, self._limit * self.backoff)
+        elif self._window_utilized:
+            self._limit = min(self.max_limit, self._limit + 1)
+        self._baseline_ms += self.smoothing * (median - self._baseline_ms)
+
+        self._window_ms = []
+        self._window_utilized = False
+
+    def snapshot(self) -> dict:
+        """Current limit, load and shed counters for tuning"""
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "baseline_ms": round(self._baseline_ms, 1) if self._baseline_ms is not None else None,
+                "latency_ewma_ms": round(self._ewma_ms, 1) if self._ewma_ms is not None else None,
+                "shed": dict(self._shed),
+            }
@@ -0,0 +1,116 @@
+"""
+Sampling Profiler for on-demand request profiling
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Collection, Iterable, List, Tuple
+
+Frame = Tuple[str, str, int]  # (function, file, first line)
+Stack = Tuple[Frame, ...]
+
+# Root frame for samples from shared threads (the event loop)
+SHARED_ROOT: Frame = ("[event loop, shared with other requests]", "", 0)
+
+_PACKAGE_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def _short_path(filename: str) -> str:
+    try:
+        return str(Path(filename).resolve().relative_to(_PACKAGE_ROOT))
+    except ValueError:
+        parts = Path(filename).parts
+        return "/".join(parts[-2:])
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampler built on sys._current_frames().
+
+    A background thread snapshots the stacks of the threads returned by
+    `threads()` every `interval` seconds, so it works without any
+    third-party profiler installed and adds no overhead when not running.
+
+    Stacks from `shared` threads are rooted under SHARED_ROOT: they may
+    belong to any request running concurrently, not just the profiled one.
+    """
+
+    def __init__(
+        self,
+        threads: Callable[[], Iterable[int]],
+        interval: float = 0.001,
+        shared: Collection[int] = (),
+    ):
+        self._threads = threads
+        self._shared = shared
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        start = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident in list(self._threads()):
+                frame = frames.get(ident)
+                if frame is None or ident == own:
+                    continue
+                stack: List[Frame] = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, _short_path(code.co_filename), code.co_firstlineno))
+                    frame = frame.f_back
+                if ident in self._shared:
+                    stack.append(SHARED_ROOT)
+                self.samples[tuple(reversed(stack))] += 1
+        self.duration = time.perf_counter() - start
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack format (flamegraph.pl, speedscope)"""
+        lines = [
+            ";".join(f"{name} ({path}:{line})" for name, path, line in stack) + f" {count}"
+            for stack, count in self.samples.most_common()
+        ]
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str = "request") -> dict:
+        """speedscope.app sampled-profile JSON"""
+        frame_index = {}
+        frames = []
+        samples = []
+        weights = []
+        for stack, count in self.samples.items():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indexes.append(frame_index[frame])
+            samples.append(indexes)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "exporter": "gsg-api",
+        }
@@ -0,0 +1,176 @@
+"""
+Full-Response Cache with byte-budget LRU eviction
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .compression import compress
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """An already-serialized response body and its compressed variants"""
+    body: bytes
+    media_type: str
+    expires_at: float
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(b) for b in self.encoded.values())
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized responses bounded by total body bytes.
+
+    Entries expire after `ttl` seconds and the whole cache is dropped when
+    the catalog version reported by the watcher changes. Compressed variants
+    are produced on first request per encoding and kept with the entry, so
+    each body is compressed at most once per codec.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, compress_min_bytes: int = 1024):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.compress_min_bytes = compress_min_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._version: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, body: bytes, media_type: str) -> CachedResponse:
+        """Store a serialized body"""
+        entry = CachedResponse(body=body, media_type=media_type, expires_at=time.monotonic() + self.ttl)
+        if entry.size > self.max_bytes:
+            return entry
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._evict()
+        return entry
+
+    def encoded_body(self, key: Hashable, entry: CachedResponse, encoding: Optional[str]) -> bytes:
+        """
+        Body of `entry` in the given encoding (None = identity).
+
+        The compressed variant is created once and stored with the entry
+        (counted against the byte budget, evicting older entries if needed,
+        and not stored if the entry would exceed the budget on its own);
+        bodies under `compress_min_bytes` are always returned uncompressed.
+        """
+        if encoding is None or len(entry.body) < self.compress_min_bytes:
+            return entry.body
+        data = entry.encoded.get(encoding)
+        if data is not None:
+            return data
+
+        data = compress(entry.body, encoding, entry.media_type)
+        with self._lock:
+            if (
+                encoding not in entry.encoded
+                and self._entries.get(key) is entry
+                and entry.size + len(data) <= self.max_bytes
+            ):
+                entry.encoded[encoding] = data
+                self._bytes += len(data)
+                self._entries.move_to_end(key)
+                self._evict()
+        return data
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within the byte budget (lock held)"""
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def set_version(self, version: Any) -> None:
+        """Invalidate everything if the catalog version changed"""
+        if version != self._version:
+            if self._version is not None:
+                logger.info("Catalog version changed (%s -> %s), clearing response cache", self._version, version)
+            self._version = version
+            self.clear()
+
+    async def _watch(self, fetch_version: Callable[[], Any], interval: float) -> None:
+        while True:
+            try:
+                self.set_version(await asyncio.to_thread(fetch_version))
+            except Exception as e:
+                logger.warning("Catalog version check failed: %s", e)
+            await asyncio.sleep(interval)
+
+    def start_version_watch(self, fetch_version: Callable[[], Any], interval: float) -> None:
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self._watch(fetch_version, interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """Size and hit-rate counters for health/metrics"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "catalog_version": self._version,
+            }
+
+
+# Global instance
+response_cache = ResponseCache(
+    max_bytes=get_settings().response_cache_max_bytes,
+    ttl=get_settings().response_cache_ttl,
+    compress_min_bytes=get_settings().compress_min_bytes,
+)
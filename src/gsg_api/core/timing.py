@@ -0,0 +1,88 @@
+"""
+Per-request phase timing (Server-Timing header)
+"""
+import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Generator, Optional, Set
+
+from fastapi.routing import APIRoute
+
+
+class ServerTiming:
+    """Accumulates durations per phase for a single request"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        # Event-loop thread; shared with every other in-flight request
+        self.loop_thread = threading.get_ident()
+        # Threads currently running this request's handler (used by the profiler)
+        self.threads: Set[int] = {self.loop_thread}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def header(self) -> str:
+        """Render as a Server-Timing header value (durations in ms)"""
+        parts = []
+        for name, seconds in self.phases.items():
+            part = f"{name};dur={seconds * 1000:.1f}"
+            if self.counts[name] > 1:
+                part += f';desc="{self.counts[name]}x"'
+            parts.append(part)
+        parts.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.1f}")
+        return ", ".join(parts)
+
+
+server_timing: ContextVar[Optional[ServerTiming]] = ContextVar("server_timing", default=None)
+
+
+@contextmanager
+def timed(name: str) -> Generator[None, None, None]:
+    """Record the duration of a block under `name` for the current request"""
+    timing = server_timing.get()
+    if timing is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start)
+
+
+def track_handler_thread(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Register the worker thread running a sync endpoint with the current
+    request's ServerTiming for as long as the endpoint runs.
+    """
+    if asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        timing = server_timing.get()
+        if timing is None:
+            return endpoint(*args, **kwargs)
+        ident = threading.get_ident()
+        timing.threads.add(ident)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            timing.threads.discard(ident)
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """APIRoute whose sync endpoints are visible to the request profiler"""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, track_handler_thread(endpoint), **kwargs)
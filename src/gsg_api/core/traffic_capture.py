@@ -0,0 +1,147 @@
+"""
+Traffic Capture - sampled request log for replay benchmarks
+"""
+import hashlib
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import get_settings
+
+# Never captured: diagnostics, UI and docs
+SKIP_PREFIXES = ("/health", "/ready", "/console", "/static", "/docs", "/redoc", "/openapi.json")
+
+# Query parameters that must not end up in a capture
+DROP_PARAMS = {"profile", "api_key", "x-api-key"}
+
+
+def hash_api_key(api_key: str) -> Optional[str]:
+    """Stable, non-reversible identifier for an API key"""
+    if not api_key:
+        return None
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class TrafficRecorder:
+    """
+    Writes capture records as JSON lines to a size-rotated file.
+
+    Records are handed to a background thread through a queue, so the
+    request path never waits on disk I/O.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._logger = logging.getLogger("gsg_api.traffic_capture")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self) -> None:
+        if self._listener is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            self.path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding="utf-8"
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._listener = logging.handlers.QueueListener(log_queue, file_handler)
+        self._listener.start()
+
+    def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in list(self._logger.handlers):
+            self._logger.removeHandler(handler)
+        self._listener = None
+
+    @property
+    def running(self) -> bool:
+        return self._listener is not None
+
+    def record(self, entry: dict) -> None:
+        self._logger.info(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+
+
+class TrafficCaptureMiddleware:
+    """
+    ASGI middleware recording a sample of API requests.
+
+    Each record holds the route template, normalized query parameters,
+    a hash of the API key, status, duration and response size, which is
+    everything the replay tool needs to re-issue the request.
+    """
+
+    def __init__(self, app: ASGIApp, recorder: TrafficRecorder, sample_rate: float):
+        self.app = app
+        self.recorder = recorder
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.recorder.running
+            or scope["path"].startswith(SKIP_PREFIXES)
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 0
+        response_bytes = 0
+        content_encoding = None
+
+        async def send_counting(message: Message) -> None:
+            nonlocal status, response_bytes, content_encoding
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_encoding = Headers(raw=message["headers"]).get("content-encoding")
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_counting)
+        finally:
+            headers = Headers(scope=scope)
+            query = scope.get("query_string", b"").decode("latin-1")
+            params = sorted(
+                (k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k.lower() not in DROP_PARAMS
+            )
+            route = scope.get("route")
+            self.recorder.record({
+                "ts": round(time.time(), 3),
+                "method": scope["method"],
+                "route": getattr(route, "path", scope["path"]),
+                "path": scope["path"],
+                "params": params,
+                "accept_encoding": headers.get("accept-encoding"),
+                "api_key_hash": hash_api_key(headers.get("x-api-key", "")),
+                "status": status or 500,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                "response_bytes": response_bytes,
+                "content_encoding": content_encoding,
+            })
+
+
+# Global instance
+traffic_recorder = TrafficRecorder(
+    path=get_settings().capture_path,
+    max_bytes=get_settings().capture_max_bytes,
+    backup_count=get_settings().capture_backup_count,
+)
@@ -2,21 +2,68 @@
 GSG API - Gravity Sports Group Product API
 Main FastAPI Application
 """
+import logging
+import math
 import os
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+import anyio.to_thread
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
+from .core.auth import is_admin_key
+from .core.compression import CompressionMiddleware
 from .core.config import get_settings
+from .core.database import DatabaseUnavailableError, db
+from .core.health import health_monitor
+from .core.limiter import RequestShedError, request_deadline
+from .core.profiler import SamplingProfiler
+from .core.response_cache import response_cache
+from .core.timing import ServerTiming, server_timing
+from .core.traffic_capture import TrafficCaptureMiddleware, traffic_recorder
 from .routers import products, brands
+from .services.brand_resolver import brand_resolver
+from .services.product_service import product_service
+from .warmup import warmup
+
+logger = logging.getLogger(__name__)
 
 # Static files path
 STATIC_DIR = Path(__file__).parent / "static"
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown hooks"""
+    # Queued DB queries hold a worker thread while they wait; keep a reserve
+    # so cache hits and non-DB endpoints still get threads under load
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    db.limiter.fit_threads(settings.threadpool_size - settings.threadpool_reserve)
+    if settings.capture_enabled:
+        traffic_recorder.start()
+    health_monitor.start()
+    if settings.warmup_enabled:
+        await warmup.start(app, settings.warmup_budget_seconds)
+    else:
+        warmup.ready = True
+        try:
+            brand_resolver.load()
+        except Exception as e:
+            # Static aliases keep working; the index retries on first use
+            logger.warning("Brand index not loaded at startup: %s", e)
+    response_cache.start_version_watch(product_service.get_catalog_version, settings.catalog_version_interval)
+    yield
+    await response_cache.stop()
+    await health_monitor.stop()
+    traffic_recorder.stop()
+    db.close_pool()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.api_title,
@@ -24,6 +71,7 @@ app = FastAPI(
     version=settings.api_version,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -35,6 +83,83 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression (zstd/br/gzip per Accept-Encoding)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compress_min_bytes)
+
+# Sampled traffic capture for replay benchmarks (opt-in)
+if settings.capture_enabled:
+    app.add_middleware(
+        TrafficCaptureMiddleware,
+        recorder=traffic_recorder,
+        sample_rate=settings.capture_sample_rate,
+    )
+
+
+@app.middleware("http")
+async def request_deadline_middleware(request: Request, call_next):
+    """
+    Attach a deadline to the request for the DB concurrency limiter.
+
+    Clients may send `X-Request-Timeout` (seconds) to shorten it; otherwise,
+    and for values that aren't a positive finite number, the default
+    deadline applies. Queries issued after it has passed are shed instead
+    of waiting for a slot.
+    """
+    timeout = settings.db_limit_request_deadline
+    header = request.headers.get("x-request-timeout")
+    if header:
+        try:
+            requested = float(header)
+        except ValueError:
+            requested = math.nan
+        if math.isfinite(requested) and requested > 0:
+            timeout = min(requested, timeout)
+    request_deadline.set(time.monotonic() + timeout)
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def server_timing_middleware(request: Request, call_next):
+    """
+    Emit a Server-Timing header with per-phase durations.
+
+    With `?profile=1` (collapsed stacks) or `?profile=speedscope` and an
+    admin API key, the request runs under the sampling profiler and the
+    profile is returned instead of the response body.
+    """
+    timing = ServerTiming()
+    server_timing.set(timing)
+
+    profile = request.query_params.get("profile")
+    if profile not in ("1", "speedscope"):
+        response = await call_next(request)
+        response.headers["Server-Timing"] = timing.header()
+        return response
+
+    if not is_admin_key(request.headers.get("x-api-key", "")):
+        return JSONResponse(
+            status_code=403,
+            content={"detail": "Profiling requires an admin API key"},
+        )
+
+    profiler = SamplingProfiler(
+        lambda: timing.threads, settings.profile_sample_interval, shared={timing.loop_thread}
+    )
+    profiler.start()
+    try:
+        response = await call_next(request)
+        # Drain the body so encoding/streaming is part of the profile
+        async for _ in response.body_iterator:
+            pass
+    finally:
+        profiler.stop()
+
+    headers = {"Server-Timing": timing.header(), "X-Profiled-Status": str(response.status_code)}
+    if profile == "speedscope":
+        return JSONResponse(profiler.speedscope(name=str(request.url.path)), headers=headers)
+    return PlainTextResponse(profiler.collapsed(), headers=headers)
+
+
 # Include routers
 app.include_router(products.router)
 app.include_router(brands.router)
@@ -63,24 +188,44 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Detailed health check"""
-    from .core.database import db
-
-    # Test database connection
-    try:
-        result = db.execute_scalar("SELECT 1")
-        db_status = "connected" if result == 1 else "error"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
-
+    """Detailed health check (cached status from the background monitor)"""
     return {
-        "status": "healthy" if db_status == "connected" else "degraded",
-        "database": db_status,
+        "status": "healthy" if health_monitor.healthy else "degraded",
+        **health_monitor.status,
         "version": settings.api_version,
     }
 
 
-# Error handler
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """Readiness probe: 503 until startup warmup has finished"""
+    status = warmup.status()
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **status})
+    return {"status": "ready", **status}
+
+
+# Error handlers
+@app.exception_handler(DatabaseUnavailableError)
+async def database_unavailable_handler(request, exc):
+    retry_after = max(1, int(exc.retry_after + 0.5))
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database temporarily unavailable", "retry_after": retry_after},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+@app.exception_handler(RequestShedError)
+async def request_shed_handler(request, exc):
+    retry_after = max(1, int(exc.retry_after + 0.5))
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server overloaded, request shed", "reason": exc.reason},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     return JSONResponse(
@@ -6,14 +6,15 @@ from fastapi import APIRouter, Depends, Query
 from fastapi.responses import PlainTextResponse
 
 from ..core.auth import verify_api_key
+from ..core.timing import TimedRoute
 from ..models.product import Brand, Category, StatsResponse
 from ..services.product_service import product_service
 
-router = APIRouter(tags=["Brands & Categories"])
+router = APIRouter(tags=["Brands & Categories"], route_class=TimedRoute)
 
 
 @router.get("/brands", response_model=List[Brand])
-async def list_brands(
+def list_brands(
     format: str = Query("json", description="Response format: json or pretty"),
     _api_key: str = Depends(verify_api_key),
 ):
@@ -34,7 +35,7 @@ async def list_brands(
 
 
 @router.get("/categories", response_model=List[Category])
-async def list_categories(
+def list_categories(
     format: str = Query("json", description="Response format: json or pretty"),
     _api_key: str = Depends(verify_api_key),
 ):
@@ -54,7 +55,7 @@ async def list_categories(
 
 
 @router.get("/stats", response_model=StatsResponse)
-async def get_stats(
+def get_stats(
     format: str = Query("json", description="Response format: json or pretty"),
     _api_key: str = Depends(verify_api_key),
 ):
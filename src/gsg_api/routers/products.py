@@ -1,17 +1,22 @@
 """
 Product Router - API Endpoints
 """
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import PlainTextResponse
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response
 
 from ..core.auth import verify_api_key
+from ..core.compression import negotiate
+from ..core.config import get_settings
+from ..core.response_cache import CachedResponse, response_cache
+from ..core.timing import TimedRoute, timed
 from ..models.product import (
     ProductBase, ProductDetail, ProductListResponse, ProductPretty
 )
 from ..services.product_service import product_service
+from ..services.brand_resolver import UnknownBrandError, brand_resolver
 
-router = APIRouter(prefix="/products", tags=["Products"])
+router = APIRouter(prefix="/products", tags=["Products"], route_class=TimedRoute)
 
 
 def format_product_pretty(p: ProductDetail) -> str:
@@ -59,8 +64,223 @@ def format_list_pretty(products: ProductListResponse) -> str:
     return "\n".join(lines)
 
 
+# Rough chars-per-token for budgeting; low because article numbers,
+# EANs and German compounds split into many tokens
+CHARS_PER_TOKEN = 3
+
+# List columns: label -> cell value from a row
+COMPACT_COLUMNS = {
+    "nummer": lambda r: r["nummer"],
+    "bezeichnung": lambda r: r["bezeichnung"],
+    "marke": lambda r: r["brand_name"] or "",
+    "kat": lambda r: r["category_name"] or "",
+    "netto": lambda r: f"{r['netto_eur'] or 0:.2f}",
+    "ean": lambda r: r["ean"] or "",
+    "lieferbar": lambda r: "✓" if r["active"] else "✗",
+}
+
+# Column sets from richest to leanest, with optional max length per column
+COMPACT_LIST_LEVELS = (
+    (("nummer", None), ("bezeichnung", None), ("marke", None), ("kat", None),
+     ("netto", None), ("ean", None), ("lieferbar", None)),
+    (("nummer", None), ("bezeichnung", 50), ("marke", None), ("netto", None), ("lieferbar", None)),
+    (("nummer", None), ("bezeichnung", 25), ("netto", None)),
+)
+
+# Columns moved into the header when every row has the same value
+# (at every level, even those that would otherwise drop the column)
+COMPACT_SHARED_COLUMNS = ("marke", "kat", "lieferbar")
+
+# Shortest realistic row at the leanest level (number, short name, price);
+# bounds how many rows a budget can use, so fewer are fetched
+COMPACT_MIN_ROW_CHARS = 16
+
+
+def compact_budget(max_tokens: Optional[int], max_chars: Optional[int]) -> Optional[int]:
+    """Character budget from the request (tighter of both), else the configured default"""
+    if not max_tokens and not max_chars:
+        max_tokens = get_settings().compact_default_max_tokens
+    budgets = [b for b in (max_chars, max_tokens * CHARS_PER_TOKEN if max_tokens else None) if b]
+    return min(budgets) if budgets else None
+
+
+def _compact_cell(row: Dict[str, Any], column: str, max_len: Optional[int]) -> str:
+    value = COMPACT_COLUMNS[column](row).replace("|", "/").strip()
+    if max_len and len(value) > max_len:
+        value = value[:max_len - 1] + "…"
+    return value
+
+
+def _compact_table(
+    rows: List[Dict[str, Any]], total: int, offset: int, columns: tuple
+) -> Tuple[List[str], List[str]]:
+    """Header lines and row lines for one column set"""
+    shared = {}
+    if len(rows) > 1:
+        for column in COMPACT_SHARED_COLUMNS:
+            values = {_compact_cell(r, column, None) for r in rows}
+            if len(values) == 1:
+                shared[column] = values.pop()
+    shown = [(c, n) for c, n in columns if c not in shared]
+
+    header = [f"Produkte: {total} gefunden"]
+    if rows:
+        header[0] += f", zeige {offset + 1}-{offset + len(rows)}"
+        header[0] += "".join(f" | {c}: {v}" for c, v in shared.items())
+        header.append("|".join(c for c, _ in shown))
+    return header, ["|".join(_compact_cell(r, c, n) for c, n in shown) for r in rows]
+
+
+def format_list_compact(
+    rows: List[Dict[str, Any]], total: int, offset: int, max_chars: Optional[int] = None
+) -> str:
+    """
+    Format list rows as a pipe-separated table within `max_chars`.
+
+    Uses the richest column set that fits all rows; if none does, the
+    leanest one with as many rows as fit (at least one). When rows remain,
+    the last line is the offset to continue from.
+    """
+    footer_reserve = len(f"weiter: offset={total} ({total} weitere)") + 1
+
+    def size(lines: List[str]) -> int:
+        return sum(len(line) + 1 for line in lines)
+
+    for columns in COMPACT_LIST_LEVELS:
+        header, body = _compact_table(rows, total, offset, columns)
+        if max_chars is None or size(header) + size(body) + footer_reserve <= max_chars:
+            break
+    else:
+        # Leanest column set still too long: keep as many rows as fit
+        used = size(header) + footer_reserve
+        count = 0
+        for line in body:
+            used += len(line) + 1
+            if used > max_chars and count > 0:
+                break
+            count += 1
+        rows = rows[:count]
+        header, body = _compact_table(rows, total, offset, columns)
+
+    lines = header + body
+    next_offset = offset + len(rows)
+    if next_offset < total:
+        lines.append(f"weiter: offset={next_offset} ({total - next_offset} weitere)")
+
+    return "\n".join(lines)
+
+
+def format_product_compact(
+    row: Dict[str, Any], img_rows: List[Dict[str, Any]], max_chars: Optional[int] = None
+) -> str:
+    """
+    Format a detail row as text within `max_chars`.
+
+    Lines are added in priority order and skipped once they don't fit;
+    the article texts are cut to the remaining budget instead.
+    """
+    price = f"Preis: €{row['netto_eur'] or 0:.2f} netto"
+    if row["brutto_eur"]:
+        price += f" / €{row['brutto_eur']:.2f} brutto"
+
+    lines = [
+        f"{row['nummer']} | {row['bezeichnung']}",
+        f"Marke: {row['brand_name'] or 'N/A'} | Kat: {row['category_name'] or 'N/A'}",
+        price,
+        f"Status: {'lieferbar' if row['active'] else 'nicht lieferbar'}",
+    ]
+    optional = [
+        (f"EAN: {row['ean']}" if row["ean"] else None, False),
+        (f"Modelljahr: {row['modelljahr']}" if row["modelljahr"] else None, False),
+        ("Bilder: " + ", ".join(r["path"] for r in img_rows) if img_rows else None, False),
+        (f"Info: {row['artikeltext_kurz']}" if row["artikeltext_kurz"] else None, True),
+        (f"Text: {row['artikeltext_lang']}" if row["artikeltext_lang"] else None, True),
+    ]
+
+    used = sum(len(l) + 1 for l in lines)
+    for line, truncatable in optional:
+        if not line:
+            continue
+        line = " ".join(line.split())
+        remaining = max_chars - used - 1 if max_chars is not None else len(line)
+        if len(line) > remaining:
+            if not truncatable or remaining < 20:
+                continue
+            line = line[:remaining - 1] + "…"
+        lines.append(line)
+        used += len(line) + 1
+
+    return "\n".join(lines)
+
+
+def list_cache_key(
+    brand_id: Optional[int],
+    category_id: Optional[int],
+    search: Optional[str],
+    active: bool,
+    limit: int,
+    offset: int,
+    format: str,
+    max_chars: Optional[int] = None,
+) -> tuple:
+    """Response cache key for a /products page (brand already resolved to its ID)"""
+    return ("products", brand_id, category_id, search or None, active, limit, offset, format, max_chars)
+
+
+def render_product_list(
+    brand_id: Optional[int],
+    category_id: Optional[int],
+    search: Optional[str],
+    active: bool,
+    limit: int,
+    offset: int,
+    format: str,
+    max_chars: Optional[int] = None,
+) -> Tuple[bytes, str]:
+    """Query and serialize a /products page; returns (body, media type)"""
+    if format == "compact":
+        if max_chars is not None:
+            limit = min(limit, max_chars // COMPACT_MIN_ROW_CHARS + 1)
+        rows, total = product_service.get_product_rows(
+            brand_id=brand_id,
+            category_id=category_id,
+            search=search,
+            active_only=active,
+            limit=limit,
+            offset=offset,
+        )
+        with timed("format"):
+            text = format_list_compact(rows, total, offset, max_chars)
+        return text.encode("utf-8"), "text/plain; charset=utf-8"
+
+    result = product_service.get_products(
+        brand_id=brand_id,
+        category_id=category_id,
+        search=search,
+        active_only=active,
+        limit=limit,
+        offset=offset,
+    )
+
+    with timed("format"):
+        if format == "pretty":
+            return format_list_pretty(result).encode("utf-8"), "text/plain; charset=utf-8"
+        return result.model_dump_json().encode("utf-8"), "application/json"
+
+
+def _cached_response(key: tuple, entry: CachedResponse, request: Request, cache_status: str) -> Response:
+    """Send a cached body in the best encoding the client accepts"""
+    headers = {"X-Cache": cache_status, "Vary": "Accept-Encoding"}
+    encoding = negotiate(request.headers.get("accept-encoding"), entry.media_type)
+    body = response_cache.encoded_body(key, entry, encoding)
+    if body is not entry.body:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=entry.media_type, headers=headers)
+
+
 @router.get("", response_model=ProductListResponse)
-async def list_products(
+def list_products(
+    request: Request,
     brand: Optional[str] = Query(None, description="Filter by brand name (e.g., 'oneal')"),
     brand_id: Optional[int] = Query(None, description="Filter by brand ID"),
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
@@ -68,38 +288,60 @@ async def list_products(
     active: bool = Query(True, description="Only active/available products"),
     limit: int = Query(50, ge=1, le=500, description="Max results"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
-    format: str = Query("json", description="Response format: json or pretty"),
+    format: str = Query("json", description="Response format: json, pretty or compact"),
+    max_tokens: Optional[int] = Query(None, ge=1, description="Token budget for format=compact"),
+    max_chars: Optional[int] = Query(None, ge=1, description="Character budget for format=compact"),
     _api_key: str = Depends(verify_api_key),
 ):
     """
     List products with optional filters.
 
-    **Brands:** oneal, oakley, lezyne, evs, rekluse, azonic, kini
+    **Brands:** any name from `/brands` (case/accent-insensitive, typos tolerated),
+    e.g. oneal, oakley, lezyne, evs, rekluse, azonic, kini.
+    Unknown brands return 400 with suggestions.
 
     **Format:**
     - `json`: Full JSON response (default)
     - `pretty`: Compact text format for AI/MCP
+    - `compact`: Token-budgeted table for AI/MCP (`max_tokens`/`max_chars`);
+      ends with `weiter: offset=N` when more rows remain
     """
-    result = product_service.get_products(
-        brand=brand,
-        brand_id=brand_id,
-        category_id=category_id,
-        search=search,
-        active_only=active,
-        limit=limit,
-        offset=offset,
+    if brand:
+        try:
+            brand_id = brand_resolver.resolve(brand)
+        except UnknownBrandError as e:
+            raise HTTPException(
+                status_code=400,
+                detail={"message": str(e), "suggestions": e.suggestions},
+            )
+
+    format = format if format in ("pretty", "compact") else "json"
+    max_chars = compact_budget(max_tokens, max_chars) if format == "compact" else None
+    search = search.strip() if search else None
+    cache_key = list_cache_key(brand_id, category_id, search, active, limit, offset, format, max_chars)
+
+    if response_cache.enabled:
+        entry = response_cache.get(cache_key)
+        if entry is not None:
+            return _cached_response(cache_key, entry, request, "HIT")
+
+    body, media_type = render_product_list(
+        brand_id, category_id, search, active, limit, offset, format, max_chars
     )
 
-    if format == "pretty":
-        return PlainTextResponse(format_list_pretty(result))
+    if not response_cache.enabled:
+        return Response(body, media_type=media_type)
 
-    return result
+    entry = response_cache.put(cache_key, body, media_type)
+    return _cached_response(cache_key, entry, request, "MISS")
 
 
 @router.get("/{nummer}", response_model=ProductDetail)
-async def get_product(
+def get_product(
     nummer: str,
-    format: str = Query("json", description="Response format: json or pretty"),
+    format: str = Query("json", description="Response format: json, pretty or compact"),
+    max_tokens: Optional[int] = Query(None, ge=1, description="Token budget for format=compact"),
+    max_chars: Optional[int] = Query(None, ge=1, description="Character budget for format=compact"),
     _api_key: str = Depends(verify_api_key),
 ):
     """
@@ -107,12 +349,22 @@ async def get_product(
 
     **Example:** GET /products/0781-012
     """
+    if format == "compact":
+        result = product_service.get_product_detail_rows(nummer)
+        if not result:
+            raise HTTPException(status_code=404, detail=f"Product {nummer} not found")
+        with timed("format"):
+            return PlainTextResponse(
+                format_product_compact(*result, compact_budget(max_tokens, max_chars))
+            )
+
     product = product_service.get_product_by_nummer(nummer)
 
     if not product:
         raise HTTPException(status_code=404, detail=f"Product {nummer} not found")
 
     if format == "pretty":
-        return PlainTextResponse(format_product_pretty(product))
+        with timed("format"):
+            return PlainTextResponse(format_product_pretty(product))
 
     return product
@@ -1,4 +1,8 @@
 """Services"""
 from .product_service import product_service, ProductService
+from .brand_resolver import brand_resolver, BrandResolver, UnknownBrandError
 
-__all__ = ["product_service", "ProductService"]
+__all__ = [
+    "product_service", "ProductService",
+    "brand_resolver", "BrandResolver", "UnknownBrandError",
+]
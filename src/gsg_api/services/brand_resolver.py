@@ -0,0 +1,161 @@
+"""
+Brand Resolver - maps free-text brand names to listMarken keys
+"""
+import difflib
+import logging
+import math
+import threading
+import time
+import unicodedata
+from typing import Dict, List
+
+from ..core.config import get_settings
+from ..core.database import DatabaseUnavailableError, db
+
+logger = logging.getLogger(__name__)
+
+
+# Extra spellings that don't normalize to the listMarken name
+BRAND_ALIASES: Dict[str, int] = {
+    "oneal": 7,
+    "o'neal": 7,
+    "oakley": 19,
+    "lezyne": 13,
+    "evs": 14,
+    "rekluse": 6,
+    "azonic": 18,
+    "kini": 25,
+    "kini red bull": 25,
+}
+
+
+class UnknownBrandError(ValueError):
+    """Raised when a brand name can't be resolved to a brand ID"""
+
+    def __init__(self, brand: str, suggestions: List[str]):
+        self.brand = brand
+        self.suggestions = suggestions
+        super().__init__(f"Unknown brand '{brand}'")
+
+
+def normalize_brand(name: str) -> str:
+    """Accent-fold, casefold and strip everything but letters/digits"""
+    folded = unicodedata.normalize("NFKD", name)
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return "".join(c for c in folded.casefold() if c.isalnum())
+
+
+class BrandResolver:
+    """
+    In-memory brand name index built from dbo.listMarken.
+
+    Loaded at startup and refreshed lazily once older than
+    `brand_index_refresh_seconds`, by one request thread at a time. If the
+    database is unreachable the previous index stays in use. Until the
+    first load succeeds, loading is retried every
+    `brand_index_retry_seconds`, and names that aren't static aliases
+    raise DatabaseUnavailableError rather than UnknownBrandError.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self._refresh_seconds = settings.brand_index_refresh_seconds
+        self._retry_seconds = settings.brand_index_retry_seconds
+        self._fuzzy_cutoff = settings.brand_fuzzy_cutoff
+        self._lock = threading.Lock()
+        # Stale until the first load, however long the host has been up
+        self._loaded_at: float = -math.inf
+        self._loaded = False
+        self._names: Dict[int, str] = {}
+        self._index: Dict[str, int] = self._build_index({})
+
+    @staticmethod
+    def _build_index(names: Dict[int, str]) -> Dict[str, int]:
+        index = {normalize_brand(alias): key for alias, key in BRAND_ALIASES.items()}
+        for key, name in names.items():
+            index[normalize_brand(name)] = key
+        index.pop("", None)
+        return index
+
+    def load(self) -> None:
+        """(Re)load the brand index from listMarken"""
+        rows = db.execute_query(
+            "SELECT lngMk_Key, strMk_Marke FROM dbo.listMarken WHERE strMk_Marke IS NOT NULL"
+        )
+        names = {row["lngMk_Key"]: row["strMk_Marke"].strip() for row in rows}
+        index = self._build_index(names)
+        with self._lock:
+            self._names = names
+            self._index = index
+            self._loaded_at = time.monotonic()
+            self._loaded = True
+        logger.info("Brand index loaded: %d brands, %d keys", len(names), len(index))
+
+    def _refresh_if_stale(self) -> None:
+        # Check and claim under the lock: the claiming thread reloads, the
+        # others keep resolving against the current index meanwhile
+        with self._lock:
+            now = time.monotonic()
+            interval = self._refresh_seconds if self._loaded else self._retry_seconds
+            if now - self._loaded_at < interval:
+                return
+            self._loaded_at = now
+        try:
+            self.load()
+        except Exception as e:
+            # Keep serving the last good index (or the aliases); retry on the next interval
+            logger.warning("Brand index refresh failed: %s", e)
+
+    def _display_name(self, key: int) -> str:
+        if key in self._names:
+            return self._names[key]
+        return next(alias for alias, k in BRAND_ALIASES.items() if k == key)
+
+    def suggest(self, brand: str, limit: int = 3) -> List[str]:
+        """Closest brand names for an unresolvable input"""
+        normalized = normalize_brand(brand)
+        index = self._index
+        matches = difflib.get_close_matches(normalized, index.keys(), n=limit * 2, cutoff=0.5)
+        if normalized:
+            matches += [k for k in index if normalized in k or k in normalized]
+
+        suggestions: List[str] = []
+        for match in matches:
+            name = self._display_name(index[match])
+            if name not in suggestions:
+                suggestions.append(name)
+        return suggestions[:limit]
+
+    def resolve(self, brand: str) -> int:
+        """
+        Resolve a brand name to its listMarken key.
+
+        Matches normalized names and aliases exactly, then falls back to
+        an unambiguous fuzzy match for typos.
+
+        Raises:
+            UnknownBrandError: If no brand matches
+            DatabaseUnavailableError: If no alias matches and the index
+                has never been loaded
+        """
+        self._refresh_if_stale()
+        normalized = normalize_brand(brand)
+        index = self._index
+
+        if normalized in index:
+            return index[normalized]
+
+        close = difflib.get_close_matches(normalized, index.keys(), n=2, cutoff=self._fuzzy_cutoff)
+        candidates = {index[k] for k in close}
+        if len(candidates) == 1:
+            return candidates.pop()
+
+        if not self._loaded:
+            # Only the aliases are known; the brand may well exist
+            raise DatabaseUnavailableError("Brand index not loaded yet", retry_after=self._retry_seconds)
+
+        raise UnknownBrandError(brand, self.suggest(brand))
+
+
+# Global instance
+brand_resolver = BrandResolver()
@@ -1,9 +1,11 @@
 """
 Product Service - Business Logic
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from decimal import Decimal
 from ..core.database import db
+from ..core.timing import timed
+from .brand_resolver import brand_resolver
 from ..models.product import (
     ProductBase, ProductDetail, ProductListResponse,
     Brand, Category, ProductImage, StatsResponse
@@ -13,19 +15,6 @@ from ..models.product import (
 class ProductService:
     """Service for product-related operations"""
 
-    # Brand ID mapping for convenience
-    BRAND_IDS = {
-        "oneal": 7,
-        "o'neal": 7,
-        "oakley": 19,
-        "lezyne": 13,
-        "evs": 14,
-        "rekluse": 6,
-        "azonic": 18,
-        "kini": 25,
-        "kini red bull": 25,
-    }
-
     def get_products(
         self,
         brand: Optional[str] = None,
@@ -36,7 +25,35 @@ class ProductService:
         limit: int = 50,
         offset: int = 0,
     ) -> ProductListResponse:
-        """Get products with filters"""
+        """
+        Get products with filters.
+
+        Raises:
+            UnknownBrandError: If `brand` doesn't match any known brand
+        """
+        rows, total = self.get_product_rows(
+            brand, brand_id, category_id, search, active_only, limit, offset
+        )
+
+        with timed("model"):
+            return self._build_list(rows, total, limit, offset)
+
+    def get_product_rows(
+        self,
+        brand: Optional[str] = None,
+        brand_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        active_only: bool = True,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get raw product rows and the total match count (no model building).
+
+        Raises:
+            UnknownBrandError: If `brand` doesn't match any known brand
+        """
 
         # Build WHERE clause
         conditions = []
@@ -47,9 +64,7 @@ class ProductService:
 
         # Brand filter (by name or ID)
         if brand:
-            brand_lower = brand.lower()
-            if brand_lower in self.BRAND_IDS:
-                brand_id = self.BRAND_IDS[brand_lower]
+            brand_id = brand_resolver.resolve(brand)
 
         if brand_id:
             conditions.append("a.lngA_Marke_FKey = ?")
@@ -72,7 +87,8 @@ class ProductService:
         count_query = f"""
             SELECT COUNT(*) FROM dbo.tblArtikel a WHERE {where_clause}
         """
-        total = db.execute_scalar(count_query, tuple(params) if params else None)
+        with timed("count-query"):
+            total = db.execute_scalar(count_query, tuple(params) if params else None)
 
         # Get products (OFFSET/FETCH for SQL Server pagination)
         query = f"""
@@ -95,8 +111,14 @@ class ProductService:
             OFFSET {offset} ROWS FETCH NEXT {limit} ROWS ONLY
         """
 
-        rows = db.execute_query(query, tuple(params) if params else None)
+        with timed("list-query"):
+            rows = db.execute_query(query, tuple(params) if params else None)
+
+        return rows, total
 
+    @staticmethod
+    def _build_list(rows: List[Dict[str, Any]], total: int, limit: int, offset: int) -> ProductListResponse:
+        """Build the list response model from query rows"""
         items = [
             ProductBase(
                 id=row["id"],
@@ -123,6 +145,17 @@ class ProductService:
 
     def get_product_by_nummer(self, nummer: str) -> Optional[ProductDetail]:
         """Get single product by article number"""
+        result = self.get_product_detail_rows(nummer)
+        if not result:
+            return None
+
+        with timed("model"):
+            return self._build_detail(*result)
+
+    def get_product_detail_rows(
+        self, nummer: str
+    ) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Get the raw detail row and image rows for an article number"""
 
         query = """
             SELECT
@@ -158,7 +191,8 @@ class ProductService:
             WHERE a.strA_Nummer = ?
         """
 
-        rows = db.execute_query(query, (nummer,))
+        with timed("detail-query"):
+            rows = db.execute_query(query, (nummer,))
         if not rows:
             return None
 
@@ -171,7 +205,14 @@ class ProductService:
             WHERE lngAB_A_FKey = ?
             ORDER BY lngAB_Sortierung
         """
-        img_rows = db.execute_query(img_query, (row["id"],))
+        with timed("images-query"):
+            img_rows = db.execute_query(img_query, (row["id"],))
+
+        return row, img_rows
+
+    @staticmethod
+    def _build_detail(row: Dict[str, Any], img_rows: List[Dict[str, Any]]) -> ProductDetail:
+        """Build the detail model from the detail and image rows"""
         images = [ProductImage(path=r["path"], sort=r["sort"] or 1) for r in img_rows]
 
         return ProductDetail(
@@ -201,6 +242,28 @@ class ProductService:
             active=bool(row["active"]),
         )
 
+    def get_catalog_version(self) -> int:
+        """
+        Checksum over everything shown in product lists: the article list
+        columns plus brand and category names.
+
+        Changes whenever an article, brand or category is added, removed or
+        edited, and is used to invalidate cached list pages. Runs as a
+        background query, outside the request concurrency limit.
+        """
+        return db.execute_scalar("""
+            SELECT CHECKSUM(
+                (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(
+                    lngA_Key, strA_Nummer, strA_Bezeichnung, lngA_Marke_FKey,
+                    lngA_AGruppe_FKey, decA_Netto, strA_EAN, boolA_NichtMehrLieferbar
+                 )) FROM dbo.tblArtikel),
+                (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(lngMk_Key, strMk_Marke))
+                 FROM dbo.listMarken),
+                (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(lngAGruppe_Key, strAGruppe_Name))
+                 FROM dbo.listArtikelgruppen)
+            )
+        """, background=True)
+
     def get_brands(self) -> List[Brand]:
         """Get all brands with article counts"""
         query = """
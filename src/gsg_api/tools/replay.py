@@ -0,0 +1,208 @@
+"""
+Traffic Replay - re-issue captured requests against a GSG API instance
+
+Reads the JSON-lines files written by the traffic capture middleware
+(CAPTURE_ENABLED=true) and replays them in their original order, either
+at the captured pacing (scaled by --speed) or as fast as --concurrency
+allows. Reports latency percentiles per route and differences against
+the captured status/size, or against a --baseline instance.
+
+Usage:
+    python -m src.gsg_api.tools.replay captures/traffic.jsonl \\
+        --target http://localhost:8000 --api-key KEY --speed 2 --concurrency 16
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+
+@dataclass
+class Result:
+    """Outcome of one replayed request"""
+    record: dict
+    status: int
+    latency_ms: float
+    size: int
+    body_hash: Optional[str] = None
+    baseline_status: Optional[int] = None
+    baseline_hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+def load_records(paths: List[str], limit: Optional[int] = None) -> List[dict]:
+    """Load capture records from one or more files, ordered by timestamp"""
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    records.sort(key=lambda r: r["ts"])
+    return records[:limit] if limit else records
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def body_digest(response: httpx.Response) -> str:
+    """Hash of the decoded body; JSON is canonicalized so key order doesn't matter"""
+    content = response.content
+    if response.headers.get("content-type", "").startswith("application/json"):
+        try:
+            content = json.dumps(response.json(), sort_keys=True).encode("utf-8")
+        except ValueError:
+            pass
+    return hashlib.sha256(content).hexdigest()
+
+
+async def send(client: httpx.AsyncClient, record: dict, headers: Dict[str, str]) -> httpx.Response:
+    request_headers = dict(headers)
+    if record.get("accept_encoding"):
+        request_headers["accept-encoding"] = record["accept_encoding"]
+    return await client.request(
+        record["method"], record["path"], params=record["params"], headers=request_headers
+    )
+
+
+async def replay(
+    records: List[dict],
+    target: str,
+    api_key: str,
+    speed: float,
+    concurrency: int,
+    timeout: float,
+    baseline: Optional[str] = None,
+) -> List[Result]:
+    """Replay records against `target` (and `baseline`, if given)"""
+    headers = {"x-api-key": api_key} if api_key else {}
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=target, timeout=timeout, limits=limits) as client, \
+            httpx.AsyncClient(base_url=baseline or target, timeout=timeout, limits=limits) as base_client:
+
+        async def run(record: dict) -> Result:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await send(client, record, headers)
+                except httpx.HTTPError as e:
+                    return Result(record, 0, (time.perf_counter() - start) * 1000, 0, error=f"{type(e).__name__}: {e}")
+                latency_ms = (time.perf_counter() - start) * 1000
+                result = Result(
+                    record,
+                    response.status_code,
+                    latency_ms,
+                    int(response.headers.get("content-length", len(response.content))),
+                )
+                if baseline:
+                    result.body_hash = body_digest(response)
+                    try:
+                        base = await send(base_client, record, headers)
+                        result.baseline_status = base.status_code
+                        result.baseline_hash = body_digest(base)
+                    except httpx.HTTPError as e:
+                        result.error = f"baseline: {type(e).__name__}: {e}"
+                return result
+
+        tasks = []
+        t0 = records[0]["ts"] if records else 0
+        start = time.perf_counter()
+        for record in records:
+            if speed > 0:
+                delay = (record["ts"] - t0) / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(run(record)))
+        return await asyncio.gather(*tasks)
+
+
+def report(results: List[Result], elapsed: float, out=sys.stdout) -> int:
+    """Print latency percentiles and diffs; returns the number of mismatches"""
+    by_route: Dict[str, List[Result]] = defaultdict(list)
+    for r in results:
+        by_route[f"{r.record['method']} {r.record['route']}"].append(r)
+
+    print(f"Replayed {len(results)} requests in {elapsed:.1f}s "
+          f"({len(results) / elapsed if elapsed else 0:.1f} req/s)\n", file=out)
+    header = f"{'route':<32} {'n':>6} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8} {'captured p50':>13}"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    rows = sorted(by_route.items()) + [("ALL", results)]
+    for route, items in rows:
+        lat = [r.latency_ms for r in items if not r.error]
+        captured = [r.record["duration_ms"] for r in items]
+        print(
+            f"{route[:32]:<32} {len(items):>6} {percentile(lat, 50):>8.1f} {percentile(lat, 90):>8.1f} "
+            f"{percentile(lat, 95):>8.1f} {percentile(lat, 99):>8.1f} {max(lat, default=0):>8.1f} "
+            f"{percentile(captured, 50):>13.1f}",
+            file=out,
+        )
+
+    errors = [r for r in results if r.error]
+    status_diffs = [r for r in results if not r.error and r.status != (r.baseline_status or r.record["status"])]
+    body_diffs = [r for r in results if r.baseline_hash and r.body_hash != r.baseline_hash]
+    size_deltas = [
+        r.size - r.record["response_bytes"] for r in results
+        if not r.error and r.record.get("response_bytes") and not r.baseline_hash
+    ]
+
+    print(f"\nErrors:            {len(errors)}", file=out)
+    print(f"Status mismatches: {len(status_diffs)} "
+          f"(vs {'baseline' if any(r.baseline_status for r in results) else 'capture'})", file=out)
+    if any(r.baseline_hash for r in results):
+        print(f"Body mismatches:   {len(body_diffs)}", file=out)
+    if size_deltas:
+        print(f"Size delta vs capture (bytes): median {percentile(size_deltas, 50):+.0f}, "
+              f"max {max(size_deltas, key=abs):+.0f}", file=out)
+
+    for r in (errors + status_diffs + body_diffs)[:10]:
+        query = "&".join(f"{k}={v}" for k, v in r.record["params"])
+        expected = r.baseline_status or r.record["status"]
+        print(f"  {r.record['method']} {r.record['path']}?{query} -> {r.status} "
+              f"(expected {expected}){' ' + r.error if r.error else ''}", file=out)
+
+    return len(errors) + len(status_diffs) + len(body_diffs)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay captured GSG API traffic")
+    parser.add_argument("captures", nargs="+", help="Capture file(s) (JSON lines)")
+    parser.add_argument("--target", required=True, help="Base URL of the instance under test")
+    parser.add_argument("--baseline", help="Base URL to diff responses against")
+    parser.add_argument("--api-key", default="", help="API key to send (captures only hold hashes)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Pacing factor: 1 = original, 2 = twice as fast, 0 = no pacing")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max requests in flight")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (s)")
+    parser.add_argument("--limit", type=int, help="Only replay the first N records")
+    args = parser.parse_args(argv)
+
+    records = load_records(args.captures, args.limit)
+    if not records:
+        print("No records to replay", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    results = asyncio.run(replay(
+        records, args.target, args.api_key, args.speed, args.concurrency, args.timeout, args.baseline
+    ))
+    mismatches = report(results, time.perf_counter() - start)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
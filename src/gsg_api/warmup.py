@@ -0,0 +1,122 @@
+"""
+Startup Warmup & Readiness
+
+Runs once per worker during lifespan startup so the first real requests
+don't pay for ODBC driver loading, cold connections, empty caches and
+first-call schema building. `/ready` reports 503 until it has finished.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI
+
+from .core.config import get_settings
+from .core.database import db
+from .core.response_cache import response_cache
+from .models.product import ProductDetail, ProductListResponse
+from .routers.products import list_cache_key, render_product_list
+from .services.brand_resolver import brand_resolver
+from .services.product_service import product_service
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """Runs the warmup steps and tracks readiness"""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _step(self, name: str, fn: Callable[[], Any]) -> None:
+        start = time.perf_counter()
+        try:
+            detail = fn()
+            self.steps[name] = {"ok": True}
+            if detail is not None:
+                self.steps[name]["detail"] = detail
+        except Exception as e:
+            logger.warning("Warmup step %s failed: %s", name, e)
+            self.steps[name] = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.steps[name]["ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    @staticmethod
+    def _open_connections() -> int:
+        # Loads the ODBC driver; the concurrent pings each open a connection,
+        # which DatabaseManager then keeps in its idle pool
+        count = get_settings().warmup_connections
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            return sum(pool.map(lambda _: db.ping(), range(count)))
+
+    @staticmethod
+    def _prime_reference_data() -> None:
+        brand_resolver.load()
+        product_service.get_brands()
+        product_service.get_categories()
+        product_service.get_stats()
+
+    @staticmethod
+    def _prime_product_pages() -> int:
+        """Render the first /products page of the largest brands into the response cache"""
+        if not response_cache.enabled:
+            return 0
+        # Pin the catalog version first so the watcher's first check keeps these entries
+        response_cache.set_version(product_service.get_catalog_version())
+        top = get_settings().warmup_top_brands
+        brand_ids: List[Optional[int]] = [None] + [b.id for b in product_service.get_brands()[:top]]
+        primed = 0
+        for brand_id in brand_ids:
+            for format in ("json", "pretty"):
+                key = list_cache_key(brand_id, None, None, True, 50, 0, format)
+                body, media_type = render_product_list(brand_id, None, None, True, 50, 0, format)
+                response_cache.put(key, body, media_type)
+                primed += 1
+        return primed
+
+    @staticmethod
+    def _build_schemas(app: FastAPI) -> None:
+        app.openapi()
+        for model in (ProductListResponse, ProductDetail):
+            model.model_json_schema()
+
+    def run(self, app: FastAPI) -> None:
+        """Run all steps (blocking)"""
+        self.started_at = time.time()
+        self._step("db_connections", self._open_connections)
+        self._step("reference_data", self._prime_reference_data)
+        self._step("product_pages", self._prime_product_pages)
+        self._step("schemas", lambda: self._build_schemas(app))
+        self.finished_at = time.time()
+        self.ready = True
+        logger.info("Warmup finished in %.1fs", self.finished_at - self.started_at)
+
+    async def start(self, app: FastAPI, budget: float) -> None:
+        """
+        Run warmup in a thread, waiting at most `budget` seconds.
+
+        If the budget runs out the worker starts serving anyway, but keeps
+        reporting not-ready until the remaining steps are done.
+        """
+        self._task = asyncio.create_task(asyncio.to_thread(self.run, app))
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=budget)
+        except asyncio.TimeoutError:
+            logger.warning("Warmup exceeded its %.0fs budget, continuing in background", budget)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "steps": self.steps,
+        }
+
+
+# Global instance
+warmup = Warmup()
@@ -0,0 +1,65 @@
+"""
+Tests for the adaptive DB concurrency limiter
+"""
+import itertools
+
+from gsg_api.core.limiter import AdaptiveLimiter
+
+# Per-request query mix of a list call: count, list, brands, images (seconds)
+MIXED_LATENCIES = (0.150, 0.030, 0.020, 0.005)
+
+
+def drive(limiter: AdaptiveLimiter, latencies, samples: int, concurrency: int = 1) -> None:
+    """Feed `samples` latencies through the limiter, `concurrency` at a time"""
+    source = itertools.cycle(latencies)
+    for _ in range(samples // concurrency):
+        for _ in range(concurrency):
+            limiter.acquire()
+        for _ in range(concurrency):
+            limiter.release(next(source))
+
+
+def test_mixed_latencies_keep_limit_unutilized():
+    limiter = AdaptiveLimiter(initial_limit=8)
+    drive(limiter, MIXED_LATENCIES, 2000)
+    assert limiter.limit == 8
+
+
+def test_mixed_latencies_grow_limit_when_utilized():
+    limiter = AdaptiveLimiter(initial_limit=8, max_limit=32)
+    drive(limiter, MIXED_LATENCIES, 2000, concurrency=8)
+    assert limiter.limit > 8
+
+
+def test_sustained_latency_rise_shrinks_limit():
+    limiter = AdaptiveLimiter(initial_limit=16)
+    drive(limiter, MIXED_LATENCIES, 400)
+    drive(limiter, tuple(t * 5 for t in MIXED_LATENCIES), 200)
+    assert limiter.limit < 16
+
+
+def test_single_slow_sample_does_not_shrink_limit():
+    limiter = AdaptiveLimiter(initial_limit=8)
+    drive(limiter, (0.005,), 100)
+    drive(limiter, (2.0,), 1)
+    drive(limiter, (0.005,), 100)
+    assert limiter.limit == 8
+
+
+def test_failures_shrink_limit():
+    limiter = AdaptiveLimiter(initial_limit=8, backoff=0.5)
+    limiter.acquire()
+    limiter.release(0.01, ok=False)
+    assert limiter.limit == 4
+
+
+def test_fit_threads_caps_limit_and_queue():
+    limiter = AdaptiveLimiter(initial_limit=8, max_limit=32, max_queue=64)
+    limiter.fit_threads(48)
+    assert limiter.max_limit == 32
+    assert limiter.max_queue == 16
+
+    limiter.fit_threads(4)
+    assert limiter.max_limit == 4
+    assert limiter.max_queue == 0
+    assert limiter.limit == 4
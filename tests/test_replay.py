@@ -0,0 +1,20 @@
+"""
+Tests for the traffic replay tool
+"""
+from gsg_api.tools.replay import percentile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 11))
+    assert percentile(values, 50) == 5
+    assert percentile(values, 90) == 9
+    assert percentile(values, 99) == 10
+    assert percentile(values, 100) == 10
+    assert percentile(values, 0) == 1
+
+
+def test_percentile_small_samples():
+    assert percentile([3.9, 1.5], 50) == 1.5
+    assert percentile([3.9, 1.5], 95) == 3.9
+    assert percentile([7.0], 50) == 7.0
+    assert percentile([], 50) == 0.0
@@ -0,0 +1,34 @@
+"""
+Tests for the byte-budget response cache
+"""
+import os
+
+from gsg_api.core.response_cache import ResponseCache
+
+
+def body(size: int) -> bytes:
+    # Hex of random bytes: compresses to roughly half its size
+    return os.urandom(size // 2).hex().encode()
+
+
+def test_compressed_variants_stay_within_budget():
+    cache = ResponseCache(max_bytes=30000, ttl=300)
+    for key in range(3):
+        cache.put(key, body(9000), "application/json")
+        entry = cache.get(key)
+        for encoding in ("gzip", "br", "zstd"):
+            cache.encoded_body(key, entry, encoding)
+
+    snapshot = cache.snapshot()
+    assert snapshot["bytes"] <= 30000
+    assert snapshot["evictions"] > 0
+
+
+def test_variant_not_stored_when_entry_would_exceed_budget():
+    cache = ResponseCache(max_bytes=9500, ttl=300)
+    entry = cache.put("k", body(9000), "application/json")
+    data = cache.encoded_body("k", entry, "gzip")
+
+    assert data != entry.body
+    assert "gzip" not in entry.encoded
+    assert cache.snapshot()["bytes"] == 9000